@@ -10,23 +10,74 @@ import json
 import os
 import time
 import hashlib
+import functools
+import importlib
+import importlib.machinery
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Any, Union
-from dataclasses import dataclass, asdict
+from typing import AbstractSet, Callable, Dict, Iterable, List, Optional, Set, Tuple, Any, Union
+from dataclasses import dataclass, asdict, fields
 import threading
 import queue
 import argparse
+import socket
+import socketserver
+import subprocess
+import tempfile
+import stat
+from collections import OrderedDict
 
 try:
-    import jedi
-    from jedi.api import Script
-    from jedi.api.classes import Name
-    JEDI_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    JEDI_AVAILABLE = False
-    print("Warning: Jedi not available. Some features may be limited.", file=sys.stderr)
+    ORJSON_AVAILABLE = False
 
-@dataclass
+# slots 需要 Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# 排除常见的非源码目录
+EXCLUDE_DIRS = frozenset({
+    '__pycache__', '.git', '.vscode', 'node_modules', 
+    '.pytest_cache', '.mypy_cache', 'venv', 'env',
+    '.tox', 'build', 'dist', '.eggs'
+})
+
+def _iter_py_files(root: str, exclude_dirs: AbstractSet[str] = EXCLUDE_DIRS):
+    """基于 os.scandir 遍历目录，产出 .py 文件路径（排除目录在下探前剪枝）"""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    # 排除目录按名称剪枝，整棵子树都不会被枚举
+                    if entry.name in exclude_dirs:
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith('.py') and entry.is_file():
+                            yield entry.path
+                    except OSError:
+                        continue
+        except (OSError, PermissionError):
+            continue
+
+def _unparse(node: ast.AST) -> str:
+    """将注解/默认值节点转换为源码字符串，常见节点走快速路径"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Constant) and (node.value is None or type(node.value) in (bool, int)):
+        return repr(node.value)
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+        return f"{node.value.id}.{node.attr}"
+    return ast.unparse(node)
+
+def _default_cache_dir() -> str:
+    """获取默认的持久化缓存目录"""
+    base_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base_dir, 'python-override-hint')
+
+@dataclass(**_DATACLASS_OPTIONS)
 class OverrideInfo:
     """重写方法信息"""
     class_name: str
@@ -48,13 +99,59 @@ class OverrideInfo:
     child_file_path: Optional[str] = None
     child_line: Optional[int] = None
     child_signature: Optional[str] = None
+    
+    def __post_init__(self):
+        # 类名、方法名和文件路径在结果中大量重复，驻留以共享同一字符串对象
+        self.class_name = sys.intern(self.class_name)
+        self.method = sys.intern(self.method)
+        if self.base is not None:
+            self.base = sys.intern(self.base)
+        if self.base_file_path is not None:
+            self.base_file_path = sys.intern(self.base_file_path)
+        if self.child is not None:
+            self.child = sys.intern(self.child)
+        if self.child_file_path is not None:
+            self.child_file_path = sys.intern(self.child_file_path)
+
+def _override_default(obj: Any) -> Dict:
+    """json 序列化回调：将 OverrideInfo 浅拷贝为字典"""
+    if isinstance(obj, OverrideInfo):
+        return {field.name: getattr(obj, field.name) for field in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps_json(obj: Any) -> bytes:
+    """将对象序列化为紧凑的 UTF-8 JSON"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass  # 如路径中含无法编码的代理字符，交给标准库处理
+    # 与 orjson 输出保持一致：不转义非 ASCII 字符；代理字符转为 \uXXXX 转义
+    text = json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=_override_default)
+    return text.encode('utf-8', 'backslashreplace')
+
+def _write_json(obj: Any) -> None:
+    """将对象序列化为单行紧凑 JSON 并写到标准输出"""
+    sys.stdout.buffer.write(_dumps_json(obj) + b'\n')
+    sys.stdout.flush()
 
 class FileCache:
     """文件缓存管理器"""
     
-    def __init__(self):
+    def __init__(self, verify_content: bool = False):
         self.cache: Dict[str, Dict] = {}
+        self.file_stamps: Dict[str, Tuple[int, int]] = {}
+        # 可选：mtime/size 未变时再比对内容哈希，用于识别同一时间戳内的重写
+        self.verify_content = verify_content
         self.file_hashes: Dict[str, str] = {}
+    
+    def _stat_key(self, file_path: str) -> Tuple[int, int]:
+        """获取文件的 (mtime_ns, size) 标识"""
+        try:
+            st = os.stat(file_path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return (0, -1)
         
     def get_file_hash(self, file_path: str) -> str:
         """获取文件内容哈希"""
@@ -66,12 +163,20 @@ class FileCache:
     
     def is_file_changed(self, file_path: str) -> bool:
         """检查文件是否已更改"""
-        current_hash = self.get_file_hash(file_path)
-        old_hash = self.file_hashes.get(file_path)
+        current_stamp = self._stat_key(file_path)
+        old_stamp = self.file_stamps.get(file_path)
         
-        if current_hash != old_hash:
-            self.file_hashes[file_path] = current_hash
+        if current_stamp != old_stamp:
+            self.file_stamps[file_path] = current_stamp
+            if self.verify_content:
+                self.file_hashes[file_path] = self.get_file_hash(file_path)
             return True
+        
+        if self.verify_content:
+            current_hash = self.get_file_hash(file_path)
+            if current_hash != self.file_hashes.get(file_path):
+                self.file_hashes[file_path] = current_hash
+                return True
         return False
     
     def get_cached_result(self, file_path: str) -> Optional[List[OverrideInfo]]:
@@ -88,16 +193,99 @@ class FileCache:
             'timestamp': time.time()
         }
 
+class _ClassCollector(ast.NodeVisitor):
+    """收集类定义节点：只沿语句块下探（含 if/try 与嵌套类），不进入函数体和表达式"""
+    
+    def __init__(self):
+        self.found: List[ast.ClassDef] = []
+    
+    def generic_visit(self, node: ast.AST) -> None:
+        for field in ('body', 'handlers', 'orelse', 'finalbody', 'cases'):
+            for child in getattr(node, field, ()):
+                self.visit(child)
+    
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.found.append(node)
+        self.generic_visit(node)
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        pass
+    
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        pass
+
+class _ClassInfoCache:
+    """类信息缓存，按 (mtime_ns, size) 判断文件是否变化，LRU 淘汰；每项只保存 stamp 与类信息，不持有语法树"""
+    
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        # 文件路径 -> (stamp, [(类名, 类信息), ...])
+        self.entries: "OrderedDict[str, Tuple[Tuple[int, int], List[Tuple[str, Dict]]]]" = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def get_class_infos(self, file_path: str,
+                        build: Callable[[List[ast.ClassDef]], List[Tuple[str, Dict]]]) -> List[Tuple[str, Dict]]:
+        """获取文件的 (类名, 类信息) 列表（不含函数内定义的类），文件未变化时复用上次的结果；
+        类信息提取完成后即丢弃语法树"""
+        st = os.stat(file_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        
+        with self.lock:
+            entry = self.entries.get(file_path)
+            if entry is not None and entry[0] == stamp:
+                self.entries.move_to_end(file_path)
+                return entry[1]
+        
+        tree = self._parse(file_path)
+        if tree is None:
+            # 不含类定义的文件无需解析
+            class_infos: List[Tuple[str, Dict]] = []
+        else:
+            collector = _ClassCollector()
+            collector.visit(tree)
+            class_infos = build(collector.found)
+        
+        with self.lock:
+            self.entries[file_path] = (stamp, class_infos)
+            self.entries.move_to_end(file_path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        
+        return class_infos
+    
+    def _parse(self, file_path: str) -> Optional[ast.Module]:
+        """按字节读取并解析文件（由 ast.parse 按 PEP 263 识别编码），源码中不含 class 关键字时返回 None"""
+        with open(file_path, 'rb') as f:
+            source = f.read()
+        
+        if b'class' not in source:
+            return None
+        return ast.parse(source, filename=file_path)
+
+_class_info_cache = _ClassInfoCache()
+
 class ProjectAnalyzer:
     """项目级分析器"""
     
-    def __init__(self, workspace_root: str):
+    # 磁盘缓存格式版本：缓存保存的是类信息提取结果，修改 _ClassCollector、源码读取方式、
+    # _process_class_definition 或签名/基类名的生成方式时必须递增，使旧缓存失效
+    CACHE_VERSION = 3
+    
+    def __init__(self, workspace_root: str, cache_dir: Optional[str] = None, scan_interval: float = 300):
         self.workspace_root = workspace_root
         self.file_cache = FileCache()
-        self.class_hierarchy: Dict[str, Dict] = {}
-        self.method_definitions: Dict[str, List[Dict]] = {}
-        self.last_full_scan = 0
-        self.scan_interval = 300  # 5分钟重新扫描一次
+        # 持久化缓存：文件路径 -> {'stamp': [mtime_ns, size], 'classes': [[类名, 类信息], ...]}
+        self.cache_dir = cache_dir or _default_cache_dir()
+        self.file_entries: Dict[str, Dict] = {}
+        self._cache_loaded = False
+        self.class_index: Dict[str, List[Dict]] = {}  # 类名 -> 所有同名类定义
+        # 方法名 -> 定义了该方法的所有类信息，覆盖整个工作区
+        self.method_index: Dict[str, List[Dict]] = {}
+        # 以下缓存随类索引一起重建
+        self._mro_cache: Dict[str, List[Dict]] = {}
+        self._mro_position_cache: Dict[str, Dict[int, int]] = {}
+        self.last_full_scan = 0.0
+        self.scan_interval = scan_interval  # 默认5分钟重新扫描一次
         
     def should_rescan(self) -> bool:
         """判断是否需要重新扫描项目"""
@@ -106,57 +294,166 @@ class ProjectAnalyzer:
     def find_python_files(self, max_files: int = 200) -> List[str]:
         """查找项目中的Python文件"""
         python_files = []
-        workspace_path = Path(self.workspace_root)
-        
-        # 排除常见的非源码目录
-        exclude_dirs = {
-            '__pycache__', '.git', '.vscode', 'node_modules', 
-            '.pytest_cache', '.mypy_cache', 'venv', 'env',
-            '.tox', 'build', 'dist', '.eggs'
-        }
         
-        try:
-            for py_file in workspace_path.rglob('*.py'):
-                # 检查是否在排除目录中
-                if any(exclude_dir in py_file.parts for exclude_dir in exclude_dirs):
-                    continue
-                    
-                python_files.append(str(py_file))
-                if len(python_files) >= max_files:
-                    break
-                    
-        except (OSError, PermissionError):
-            pass
+        for py_file in _iter_py_files(self.workspace_root, EXCLUDE_DIRS):
+            python_files.append(py_file)
+            if len(python_files) >= max_files:
+                break
             
         return python_files
     
     def build_class_hierarchy(self, files: List[str]) -> None:
         """构建类继承层次结构"""
-        self.class_hierarchy.clear()
-        self.method_definitions.clear()
+        if not self._cache_loaded:
+            self._load_cache()
         
+        file_entries = {}
+        stale_files = []
         for file_path in files:
             try:
-                self._analyze_file_structure(file_path)
-            except Exception:
-                continue  # 忽略解析错误的文件
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            stamp = [st.st_mtime_ns, st.st_size]
+            
+            # 仅重新解析自上次扫描后发生变化的文件
+            entry = self.file_entries.get(file_path)
+            if entry is None or entry['stamp'] != stamp:
+                entry = {'stamp': stamp, 'classes': []}
+                stale_files.append(file_path)
+            file_entries[file_path] = entry
+        
+        for file_path in stale_files:
+            file_entries[file_path]['classes'] = self._parse_file_worker(file_path)
+        
+        dirty = bool(stale_files) or file_entries.keys() != self.file_entries.keys()
+        self.file_entries = file_entries
+        self._rebuild_indexes()
+        
+        if dirty:
+            self._save_cache()
+    
+    def _rebuild_indexes(self) -> None:
+        """根据各文件的类信息重建类索引与方法索引"""
+        self.class_index.clear()
+        self._mro_cache.clear()
+        self._mro_position_cache.clear()
+        self.method_index.clear()
+        
+        for entry in self.file_entries.values():
+            for class_name, class_info in entry['classes']:
+                self._register_class(class_name, class_info)
     
-    def _analyze_file_structure(self, file_path: str) -> None:
-        """分析单个文件的结构"""
+    def _refresh_file(self, file_path: str) -> None:
+        """目标文件在两次全量扫描之间发生变化时，单独更新其类信息"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            tree = ast.parse(content, filename=file_path)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    self._process_class_definition(node, file_path)
-                    
-        except (SyntaxError, UnicodeDecodeError, OSError):
+            st = os.stat(file_path)
+        except OSError:
+            return
+        stamp = [st.st_mtime_ns, st.st_size]
+        
+        entry = self.file_entries.get(file_path)
+        if entry is not None and entry['stamp'] == stamp:
+            return
+        
+        self.file_entries[file_path] = {'stamp': stamp, 'classes': self._parse_file_worker(file_path)}
+        self._rebuild_indexes()
+    
+    def _cache_file_path(self) -> str:
+        """获取当前工作区的持久化缓存文件路径"""
+        workspace_hash = hashlib.md5(self.workspace_root.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"override_hint_{workspace_hash}.json")
+    
+    def _load_cache(self) -> None:
+        """从磁盘加载上次扫描的类结构"""
+        self._cache_loaded = True
+        try:
+            with open(self._cache_file_path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if not isinstance(data, dict):
+            return
+        if data.get('version') != self.CACHE_VERSION or data.get('workspace_root') != self.workspace_root:
+            return
+        
+        # 任何一项格式不符都丢弃整个缓存，避免后续构建索引时出错
+        files = data.get('files')
+        if isinstance(files, dict) and all(self._is_valid_cache_entry(entry) for entry in files.values()):
+            self.file_entries = files
+    
+    @staticmethod
+    def _is_valid_cache_entry(entry: Any) -> bool:
+        """检查磁盘缓存中单个文件条目的结构"""
+        if not isinstance(entry, dict):
+            return False
+        stamp = entry.get('stamp')
+        classes = entry.get('classes')
+        if not (isinstance(stamp, list) and len(stamp) == 2 and all(isinstance(v, int) for v in stamp)):
+            return False
+        if not isinstance(classes, list):
+            return False
+        
+        for item in classes:
+            if not (isinstance(item, list) and len(item) == 2 and isinstance(item[0], str)):
+                return False
+            class_info = item[1]
+            if not (isinstance(class_info, dict)
+                    and isinstance(class_info.get('file_path'), str)
+                    and isinstance(class_info.get('line'), int)
+                    and isinstance(class_info.get('bases'), list)
+                    and isinstance(class_info.get('methods'), dict)):
+                return False
+            for method_info in class_info['methods'].values():
+                if not (isinstance(method_info, dict)
+                        and {'line', 'signature', 'file_path'} <= method_info.keys()):
+                    return False
+        return True
+    
+    def _save_cache(self) -> None:
+        """将类结构写入磁盘缓存"""
+        cache_file = self._cache_file_path()
+        data = {
+            'version': self.CACHE_VERSION,
+            'workspace_root': self.workspace_root,
+            'files': self.file_entries
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, cache_file)
+        except OSError:
             pass
     
-    def _process_class_definition(self, class_node: ast.ClassDef, file_path: str) -> None:
+    def _parse_file_worker(self, file_path: str) -> List[Tuple[str, Dict]]:
+        """解析单个文件，忽略解析错误"""
+        try:
+            return self._analyze_file_structure(file_path)
+        except Exception:
+            return []  # 忽略解析错误的文件
+    
+    def _analyze_file_structure(self, file_path: str) -> List[Tuple[str, Dict]]:
+        """分析单个文件的结构，返回 (类名, 类信息) 列表"""
+        try:
+            return _class_info_cache.get_class_infos(
+                file_path,
+                lambda classes: [self._process_class_definition(node, file_path) for node in classes]
+            )
+        except (SyntaxError, UnicodeDecodeError, OSError):
+            return []
+    
+    def _register_class(self, class_name: str, class_info: Dict) -> None:
+        """将类信息登记到类索引与全局方法索引中"""
+        self.class_index.setdefault(class_name, []).append(class_info)
+        
+        for method_name in class_info['methods']:
+            # 全局方法索引
+            self.method_index.setdefault(method_name, []).append(class_info)
+    
+    def _process_class_definition(self, class_node: ast.ClassDef, file_path: str) -> Tuple[str, Dict]:
         """处理类定义"""
         class_name = class_node.name
         base_classes = []
@@ -169,7 +466,7 @@ class ProjectAnalyzer:
                 base_classes.append(self._get_attribute_name(base))
         
         # 存储类信息
-        self.class_hierarchy[class_name] = {
+        class_info: Dict[str, Any] = {
             'file_path': file_path,
             'line': class_node.lineno,
             'bases': base_classes,
@@ -179,34 +476,24 @@ class ProjectAnalyzer:
         # 提取方法信息
         for node in class_node.body:
             if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                method_name = node.name
-                signature = self._extract_method_signature(node)
-                
-                self.class_hierarchy[class_name]['methods'][method_name] = {
+                class_info['methods'][node.name] = {
                     'line': node.lineno,
-                    'signature': signature,
+                    'signature': self._extract_method_signature(node),
                     'file_path': file_path
                 }
-                
-                # 全局方法索引
-                method_key = f"{class_name}.{method_name}"
-                if method_key not in self.method_definitions:
-                    self.method_definitions[method_key] = []
-                
-                self.method_definitions[method_key].append({
-                    'class': class_name,
-                    'file_path': file_path,
-                    'line': node.lineno,
-                    'signature': signature
-                })
+        
+        return class_name, class_info
     
     def _get_attribute_name(self, node: ast.Attribute) -> str:
-        """获取属性的完整名称"""
-        if isinstance(node.value, ast.Name):
-            return f"{node.value.id}.{node.attr}"
-        elif isinstance(node.value, ast.Attribute):
-            return f"{self._get_attribute_name(node.value)}.{node.attr}"
-        return node.attr
+        """获取属性的完整名称（迭代展开属性链，如 a.b.Base）"""
+        parts = []
+        current: ast.expr = node
+        while isinstance(current, ast.Attribute):
+            parts.append(current.attr)
+            current = current.value
+        if isinstance(current, ast.Name):
+            parts.append(current.id)
+        return '.'.join(reversed(parts))
     
     def _extract_method_signature(self, func_node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> str:
         """提取方法签名"""
@@ -216,7 +503,7 @@ class ProjectAnalyzer:
         for arg in func_node.args.args:
             arg_str = arg.arg
             if arg.annotation:
-                arg_str += f": {ast.unparse(arg.annotation)}"
+                arg_str += f": {_unparse(arg.annotation)}"
             args.append(arg_str)
         
         # 处理默认参数
@@ -224,75 +511,91 @@ class ProjectAnalyzer:
         if defaults:
             default_offset = len(args) - len(defaults)
             for i, default in enumerate(defaults):
-                args[default_offset + i] += f" = {ast.unparse(default)}"
+                args[default_offset + i] += f" = {_unparse(default)}"
         
         # 处理返回类型注解
         return_annotation = ""
         if func_node.returns:
-            return_annotation = f" -> {ast.unparse(func_node.returns)}"
+            return_annotation = f" -> {_unparse(func_node.returns)}"
         
         return f"({', '.join(args)}){return_annotation}"
     
     def find_overrides(self, target_file: str) -> List[OverrideInfo]:
         """查找指定文件中的重写关系（包括双向检测）"""
+        # 目标文件中没有类定义时无需扫描整个工作区
+        if not self._parse_file_worker(target_file):
+            return []
+        
         # 如果需要重新扫描或者是第一次扫描
-        if self.should_rescan() or not self.class_hierarchy:
+        if self.should_rescan() or not self.class_index:
             python_files = self.find_python_files()
             self.build_class_hierarchy(python_files)
             self.last_full_scan = time.time()
         
+        # 确保目标文件的类信息是最新的（也覆盖未被全量扫描收录的文件）
+        self._refresh_file(target_file)
+        
         # 分析目标文件
         overrides = self._analyze_target_file(target_file)
         
         # 添加跨文件的父类被重写检测
         overrides.extend(self._find_parent_overridden_in_file(target_file))
         
-        return overrides
+        # 去除重复记录（如菱形继承中经由多个基类找到同一父类方法）
+        seen: Set[Tuple] = set()
+        unique_overrides = []
+        for override in overrides:
+            key = (
+                override.type, override.class_name, override.method, override.line,
+                override.child_file_path or override.base_file_path,
+                override.child_line or override.base_line
+            )
+            if key not in seen:
+                seen.add(key)
+                unique_overrides.append(override)
+        
+        return unique_overrides
     
     def _find_parent_overridden_in_file(self, target_file: str) -> List[OverrideInfo]:
         """查找目标文件中被其他文件的子类重写的方法"""
-        overrides = []
+        overrides: List[OverrideInfo] = []
         
-        # 获取目标文件中的所有类
+        # 获取目标文件中的所有类（复用已构建的类索引，无需重新解析）
         target_classes = {}
-        try:
-            with open(target_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            tree = ast.parse(content, filename=target_file)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    target_classes[node.name] = node
-        except:
+        for class_name, class_infos in self.class_index.items():
+            for class_info in class_infos:
+                if class_info['file_path'] == target_file:
+                    target_classes[class_name] = class_info
+        
+        if not target_classes:
             return overrides
         
-        # 遍历项目中的所有类，查找继承自目标文件中类的子类
-        for class_name, class_info in self.class_hierarchy.items():
-            if class_info['file_path'] == target_file:
-                continue  # 跳过同一文件中的类
-                
-            # 检查这个类是否继承自目标文件中的类
-            for base_class in class_info.get('bases', []):
-                if base_class in target_classes:
-                    # 找到了继承关系，检查方法重写
-                    parent_class_node = target_classes[base_class]
-                    child_class_info = class_info
-                    
-                    # 获取子类的方法
-                    child_methods = child_class_info.get('methods', {})
+        # 遍历项目中的所有类（含同名类），查找继承自目标文件中类的子类
+        for class_name, class_infos in self.class_index.items():
+            for class_info in class_infos:
+                if class_info['file_path'] == target_file:
+                    continue  # 跳过同一文件中的类
                     
-                    # 检查父类的每个方法是否被子类重写
-                    for method_node in parent_class_node.body:
-                        if isinstance(method_node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                            method_name = method_node.name
+                # 检查这个类是否继承自目标文件中的类
+                for base_class in class_info.get('bases', []):
+                    if base_class in target_classes:
+                        # 找到了继承关系，检查方法重写
+                        parent_class_info = target_classes[base_class]
+                        child_class_info = class_info
+                        
+                        # 获取子类的方法
+                        child_methods = child_class_info.get('methods', {})
+                        
+                        # 检查父类的每个方法是否被子类重写
+                        for method_name, method_info in parent_class_info['methods'].items():
                             if method_name in child_methods:
                                 # 父类方法被子类重写
                                 child_method_info = child_methods[method_name]
                                 override = OverrideInfo(
                                     class_name=base_class,
                                     method=method_name,
-                                    line=method_node.lineno,
-                                    signature=self._extract_method_signature(method_node),
+                                    line=method_info['line'],
+                                    signature=method_info['signature'],
                                     type='parent_overridden',
                                     child=class_name,
                                     child_file=os.path.basename(child_class_info['file_path']),
@@ -308,103 +611,113 @@ class ProjectAnalyzer:
         """分析目标文件中的重写关系"""
         overrides = []
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            tree = ast.parse(content, filename=file_path)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    class_overrides = self._find_class_overrides(node, file_path)
-                    overrides.extend(class_overrides)
-                    
-        except (SyntaxError, UnicodeDecodeError, OSError):
-            pass
+        for class_name, class_info in self._parse_file_worker(file_path):
+            overrides.extend(self._find_class_overrides(class_name, class_info, file_path))
         
         return overrides
     
-    def _find_class_overrides(self, class_node: ast.ClassDef, file_path: str) -> List[OverrideInfo]:
+    def _find_class_overrides(self, class_name: str, class_info: Dict, file_path: str) -> List[OverrideInfo]:
         """查找类中的重写关系"""
         overrides = []
-        class_name = class_node.name
         
         # 获取基类
-        base_classes = self._get_base_classes(class_node)
+        base_classes = class_info['bases']
         
         # 分析每个方法
-        for method_node in class_node.body:
-            if isinstance(method_node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                method_name = method_node.name
-                
-                # 查找父类中的同名方法
-                for base_class in base_classes:
-                    base_method = self._find_method_in_class(base_class, method_name)
-                    if base_method:
-                        # 子类重写父类方法
-                        override = OverrideInfo(
-                            class_name=class_name,
+        for method_name, method_info in class_info['methods'].items():
+            # 工作区中没有其他类定义同名方法时，不可能构成重写
+            candidates = self.method_index.get(method_name, ())
+            if len(candidates) < 2:
+                continue
+            
+            # 查找父类中的同名方法
+            for base_class in base_classes:
+                base_method = self._find_inherited_method(base_class, method_name, candidates)
+                if base_method:
+                    # 子类重写父类方法
+                    override = OverrideInfo(
+                        class_name=class_name,
+                        method=method_name,
+                        line=method_info['line'],
+                        signature=method_info['signature'],
+                        type='child_override',
+                        base=base_class,
+                        base_file=os.path.basename(base_method['file_path']),
+                        base_file_path=base_method['file_path'],
+                        base_line=base_method['line'],
+                        base_signature=base_method['signature']
+                    )
+                    overrides.append(override)
+                    
+                    # 如果父类在同一文件中，添加被重写标记
+                    if base_method['file_path'] == file_path:
+                        parent_override = OverrideInfo(
+                            class_name=base_class,
                             method=method_name,
-                            line=method_node.lineno,
-                            signature=self._extract_method_signature(method_node),
-                            type='child_override',
-                            base=base_class,
-                            base_file=os.path.basename(base_method['file_path']),
-                            base_file_path=base_method['file_path'],
-                            base_line=base_method['line'],
-                            base_signature=base_method['signature']
+                            line=base_method['line'],
+                            signature=base_method['signature'],
+                            type='parent_overridden',
+                            child=class_name,
+                            child_file=os.path.basename(file_path),
+                            child_file_path=file_path,
+                            child_line=method_info['line'],
+                            child_signature=method_info['signature']
                         )
-                        overrides.append(override)
-                        
-                        # 如果父类在同一文件中，添加被重写标记
-                        if base_method['file_path'] == file_path:
-                            parent_override = OverrideInfo(
-                                class_name=base_class,
-                                method=method_name,
-                                line=base_method['line'],
-                                signature=base_method['signature'],
-                                type='parent_overridden',
-                                child=class_name,
-                                child_file=os.path.basename(file_path),
-                                child_file_path=file_path,
-                                child_line=method_node.lineno,
-                                child_signature=self._extract_method_signature(method_node)
-                            )
-                            overrides.append(parent_override)
+                        overrides.append(parent_override)
         
         return overrides
     
-    def _get_base_classes(self, class_node: ast.ClassDef) -> List[str]:
-        """获取类的基类列表"""
-        base_classes = []
-        for base in class_node.bases:
-            if isinstance(base, ast.Name):
-                base_classes.append(base.id)
-            elif isinstance(base, ast.Attribute):
-                base_classes.append(self._get_attribute_name(base))
-        return base_classes
-    
-    def _find_method_in_class(self, class_name: str, method_name: str) -> Optional[Dict]:
-        """在指定类中查找方法"""
-        if class_name in self.class_hierarchy:
-            class_info = self.class_hierarchy[class_name]
-            if method_name in class_info['methods']:
-                return class_info['methods'][method_name]
+    def _flatten_mro(self, class_name: str) -> List[Dict]:
+        """按方法查找顺序（深度优先、基类按声明顺序）展开类及其所有祖先类的信息"""
+        lineage = self._mro_cache.get(class_name)
+        if lineage is not None:
+            return lineage
+        
+        # 迭代遍历，按 id 去重：既防止循环继承，也避免菱形继承中重复展开公共祖先
+        lineage = []
+        seen: Set[int] = set()
+        stack = list(reversed(self.class_index.get(class_name, ())))
+        while stack:
+            class_info = stack.pop()
+            if id(class_info) in seen:
+                continue
+            seen.add(id(class_info))
+            lineage.append(class_info)
             
-            # 递归查找基类
-            for base_class in class_info['bases']:
-                base_method = self._find_method_in_class(base_class, method_name)
-                if base_method:
-                    return base_method
+            for base_class in reversed(class_info['bases']):
+                stack.extend(reversed(self.class_index.get(base_class, ())))
         
-        return None
+        self._mro_cache[class_name] = lineage
+        return lineage
+    
+    def _get_mro_positions(self, class_name: str) -> Dict[int, int]:
+        """获取类继承链中各类信息的查找顺序：id(类信息) -> 在 _flatten_mro 中的位置"""
+        positions = self._mro_position_cache.get(class_name)
+        if positions is None:
+            positions = {id(class_info): i for i, class_info in enumerate(self._flatten_mro(class_name))}
+            self._mro_position_cache[class_name] = positions
+        return positions
+    
+    def _find_inherited_method(self, class_name: str, method_name: str,
+                               candidates: Iterable[Dict]) -> Optional[Dict]:
+        """在定义了该方法的类中找出位于类继承链上、查找顺序最靠前的一个，返回其方法信息"""
+        positions = self._get_mro_positions(class_name)
+        found: Optional[Dict] = None
+        found_position = len(positions)
+        for class_info in candidates:
+            position = positions.get(id(class_info))
+            if position is not None and position < found_position:
+                found, found_position = class_info, position
+        return found['methods'][method_name] if found is not None else None
 
 class OverrideAnalyzerServer:
     """分析器服务器模式"""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None, scan_interval: float = 300):
+        self.cache_dir = cache_dir
+        self.scan_interval = scan_interval
         self.analyzers: Dict[str, ProjectAnalyzer] = {}
-        self.message_queue = queue.Queue()
+        self.message_queue: "queue.Queue[Dict]" = queue.Queue()
         self.running = False
         
     def start_server(self):
@@ -412,7 +725,7 @@ class OverrideAnalyzerServer:
         self.running = True
         # 发送JSON格式的ready信号
         ready_signal = {"type": "ready"}
-        print(json.dumps(ready_signal), flush=True)
+        _write_json(ready_signal)
         
         try:
             while self.running:
@@ -421,7 +734,7 @@ class OverrideAnalyzerServer:
                     if line.strip():
                         message = json.loads(line)
                         response = self.handle_message(message)
-                        print(json.dumps(response), flush=True)
+                        _write_json(response)
                 except (EOFError, KeyboardInterrupt):
                     break
                 except json.JSONDecodeError:
@@ -431,7 +744,7 @@ class OverrideAnalyzerServer:
                         'id': 'unknown',
                         'error': str(e)
                     }
-                    print(json.dumps(error_response), flush=True)
+                    _write_json(error_response)
         finally:
             self.running = False
     
@@ -447,10 +760,10 @@ class OverrideAnalyzerServer:
                 if not file_path:
                     raise ValueError("file_path is required")
                 
-                result = self.analyze_file(file_path)
+                result = self.analyze_file(file_path, data.get('workspace_root'))
                 return {
                     'id': msg_id,
-                    'result': [asdict(override) for override in result]
+                    'result': result
                 }
             else:
                 raise ValueError(f"Unknown command: {command}")
@@ -461,14 +774,14 @@ class OverrideAnalyzerServer:
                 'error': str(e)
             }
     
-    def analyze_file(self, file_path: str) -> List[OverrideInfo]:
+    def analyze_file(self, file_path: str, workspace_root: Optional[str] = None) -> List[OverrideInfo]:
         """分析文件"""
         # 确定工作区根目录
-        workspace_root = self.find_workspace_root(file_path)
+        workspace_root = workspace_root or self.find_workspace_root(file_path)
         
         # 获取或创建分析器
         if workspace_root not in self.analyzers:
-            self.analyzers[workspace_root] = ProjectAnalyzer(workspace_root)
+            self.analyzers[workspace_root] = ProjectAnalyzer(workspace_root, self.cache_dir, self.scan_interval)
         
         analyzer = self.analyzers[workspace_root]
         return analyzer.find_overrides(file_path)
@@ -488,15 +801,197 @@ class OverrideAnalyzerServer:
         # 如果没找到，使用文件所在目录
         return str(Path(file_path).parent)
 
-def analyze_file_standalone(file_path: str, workspace_root: str) -> List[Dict]:
+DAEMON_RESPONSE_TIMEOUT = 120.0  # 客户端等待守护进程响应的最长时间（秒），含首次全量扫描
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """守护进程连接处理：按行读取请求，按行返回响应"""
+    
+    timeout = 10  # 连接读写超时（秒），空闲客户端到时即断开
+    
+    def __init__(self, request: Any, client_address: Any, server: socketserver.BaseServer,
+                 analyzer_server: 'OverrideAnalyzerDaemon'):
+        self.analyzer_server = analyzer_server
+        super().__init__(request, client_address, server)
+    
+    def handle(self):
+        try:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                # 每个连接一个线程，分析器本身不是线程安全的，按请求串行执行
+                with self.analyzer_server.lock:
+                    self.analyzer_server.last_active = time.time()
+                    response = self.analyzer_server.handle_message(message)
+                self.wfile.write(_dumps_json(response) + b'\n')
+                self.wfile.flush()
+        except OSError:
+            pass  # 客户端超时或断开
+
+class OverrideAnalyzerDaemon(OverrideAnalyzerServer):
+    """守护进程模式：通过 Unix socket 让多次独立调用复用同一分析器"""
+    
+    def __init__(self, socket_path: str, cache_dir: Optional[str] = None, idle_timeout: float = 1800):
+        # 守护进程长期存活，每次请求都重新校验工作区（只重新解析发生变化的文件），
+        # 避免跨文件结果在扫描间隔内过期
+        super().__init__(cache_dir, scan_interval=0)
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout  # 空闲超过该时间（秒）自动退出
+        self.last_active = time.time()
+        self.lock = threading.Lock()
+    
+    def start_daemon(self):
+        """启动守护进程"""
+        # 清理上次异常退出遗留的 socket 文件（只处理当前用户自己的 socket）
+        if os.path.lexists(self.socket_path):
+            if not _is_own_socket(self.socket_path):
+                print(f"Error: refusing to replace {self.socket_path}: not a socket owned by this user",
+                      file=sys.stderr)
+                return
+            existing = _connect_daemon(self.socket_path)
+            if existing is not None:
+                existing.close()
+                return  # 已有守护进程在运行
+            os.unlink(self.socket_path)
+        
+        handler = functools.partial(_DaemonRequestHandler, analyzer_server=self)
+        server = socketserver.ThreadingUnixStreamServer(self.socket_path, handler)
+        server.daemon_threads = True
+        server.timeout = self.idle_timeout
+        os.chmod(self.socket_path, 0o600)
+        
+        self.running = True
+        self.last_active = time.time()
+        try:
+            while self.running:
+                server.handle_request()
+                if time.time() - self.last_active >= self.idle_timeout:
+                    break
+        finally:
+            self.running = False
+            server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+    
+    def stop(self):
+        """停止守护进程"""
+        self.running = False
+
+def _is_private_dir(path: str) -> bool:
+    """目录属于当前用户且其他用户不可访问"""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+def _is_own_socket(path: str) -> bool:
+    """路径是当前用户创建的 Unix socket"""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+def _daemon_socket_path(workspace_root: str) -> Optional[str]:
+    """获取工作区对应的守护进程 socket 路径，没有仅当前用户可访问的目录时返回 None"""
+    if not hasattr(os, 'getuid'):
+        return None
+    
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if not runtime_dir:
+        # 共享临时目录下使用按用户区分、权限为 0700 的子目录
+        runtime_dir = os.path.join(tempfile.gettempdir(), f"override-hint-{os.getuid()}")
+        try:
+            os.mkdir(runtime_dir, 0o700)
+        except FileExistsError:
+            pass
+        except OSError:
+            return None
+    if not _is_private_dir(runtime_dir):
+        return None
+    
+    workspace_hash = hashlib.md5(workspace_root.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(runtime_dir, f"override-hint-{workspace_hash}.sock")
+
+def _connect_daemon(socket_path: str, timeout: float = DAEMON_RESPONSE_TIMEOUT) -> Optional[socket.socket]:
+    """连接守护进程（仅限当前用户的 socket），不可用时返回 None"""
+    if not _is_own_socket(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path)
+        return sock
+    except OSError:
+        sock.close()
+        return None
+
+def analyze_file_via_daemon(file_path: str, workspace_root: str, cache_dir: Optional[str] = None,
+                            spawn_timeout: float = 5.0) -> Optional[List[Dict]]:
+    """通过守护进程分析文件（不存在时自动启动），守护进程不可用时返回 None"""
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    
+    file_path = os.path.abspath(file_path)
+    workspace_root = os.path.abspath(workspace_root)
+    socket_path = _daemon_socket_path(workspace_root)
+    if socket_path is None:
+        return None
+    
+    sock = _connect_daemon(socket_path)
+    if sock is None:
+        # 编译为扩展模块时 __file__ 指向 .so，守护进程仍通过同目录的脚本启动
+        script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'analyze_override.py')
+        command = [sys.executable, script_path, '--daemon', workspace_root]
+        if cache_dir:
+            command += ['--cache-dir', cache_dir]
+        subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+        
+        deadline = time.time() + spawn_timeout
+        while sock is None and time.time() < deadline:
+            time.sleep(0.05)
+            sock = _connect_daemon(socket_path)
+        if sock is None:
+            return None
+    
+    request = {
+        'id': 'cli',
+        'command': 'analyze',
+        'data': {'file_path': file_path, 'workspace_root': workspace_root}
+    }
+    try:
+        with sock, sock.makefile('rwb') as stream:
+            stream.write(_dumps_json(request) + b'\n')
+            stream.flush()
+            response = json.loads(stream.readline())
+    except (OSError, ValueError):
+        return None  # 守护进程超时、断开或返回了无效数据
+    
+    if not isinstance(response, dict) or 'result' not in response and 'error' not in response:
+        return None
+    if 'error' in response:
+        raise RuntimeError(response['error'])
+    return response['result']
+
+def analyze_file_standalone(file_path: str, workspace_root: str, cache_dir: Optional[str] = None) -> List[OverrideInfo]:
     """独立模式分析文件"""
-    analyzer = ProjectAnalyzer(workspace_root)
-    overrides = analyzer.find_overrides(file_path)
-    return [asdict(override) for override in overrides]
+    analyzer = ProjectAnalyzer(workspace_root, cache_dir)
+    return analyzer.find_overrides(file_path)
 
 def main():
     parser = argparse.ArgumentParser(description='Python Override Analyzer')
     parser.add_argument('--server', action='store_true', help='Run in server mode')
+    parser.add_argument('--daemon', action='store_true', help='Run as a Unix socket daemon for workspace_root')
+    parser.add_argument('--use-daemon', action='store_true',
+                        help='Standalone mode: reuse (or spawn) the workspace daemon instead of rescanning')
+    parser.add_argument('--cache-dir', help='Directory for the persistent class hierarchy cache')
     parser.add_argument('file_path', nargs='?', help='File to analyze (standalone mode)')
     parser.add_argument('workspace_root', nargs='?', help='Workspace root (standalone mode)')
     
@@ -504,8 +999,17 @@ def main():
     
     if args.server:
         # 服务器模式
-        server = OverrideAnalyzerServer()
+        server = OverrideAnalyzerServer(args.cache_dir)
         server.start_server()
+    elif args.daemon:
+        # 守护进程模式（第一个位置参数为工作区根目录）
+        workspace_root = os.path.abspath(args.file_path or os.getcwd())
+        socket_path = _daemon_socket_path(workspace_root)
+        if socket_path is None:
+            print("Error: no private runtime directory available for the daemon socket", file=sys.stderr)
+            sys.exit(1)
+        daemon = OverrideAnalyzerDaemon(socket_path, args.cache_dir)
+        daemon.start_daemon()
     else:
         # 独立模式（向后兼容）
         if not args.file_path:
@@ -515,11 +1019,28 @@ def main():
         workspace_root = args.workspace_root or str(Path(args.file_path).parent)
         
         try:
-            result = analyze_file_standalone(args.file_path, workspace_root)
-            print(json.dumps(result))
+            result: Optional[List[Any]] = None
+            if args.use_daemon:
+                result = analyze_file_via_daemon(args.file_path, workspace_root, args.cache_dir)
+            if result is None:
+                result = analyze_file_standalone(args.file_path, workspace_root, args.cache_dir)
+            _write_json(result)
         except Exception as e:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
 
+def _resolve_main() -> Callable[[], None]:
+    """同目录下存在 mypyc 编译的扩展模块时，优先使用其 main 函数"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+        if os.path.exists(os.path.join(script_dir, 'analyze_override' + suffix)):
+            try:
+                # 脚本目录位于 sys.path[0]，扩展模块优先于源码被导入
+                compiled = importlib.import_module('analyze_override')
+                return compiled.main
+            except ImportError:
+                break
+    return main
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    _resolve_main()()
\ No newline at end of file
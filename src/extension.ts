@@ -88,8 +88,9 @@ class PythonProcessManager {
 
         outputChannel.appendLine('Setting up Python process handlers...');
 
-        this.pythonProcess.stdout?.on('data', (data: Buffer) => {
-            const output = data.toString();
+        // 按流解码 UTF-8，避免多字节字符被数据块边界截断
+        this.pythonProcess.stdout?.setEncoding('utf8');
+        this.pythonProcess.stdout?.on('data', (output: string) => {
             outputChannel.appendLine(`Python stdout: ${output}`);
             this.outputBuffer += output;
             this.processOutput();